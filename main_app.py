@@ -6,6 +6,7 @@ from tts_service import TextToSpeechService
 from llm_service import LLMService
 from memory_service_chroma import ChromaMemoryService as MemoryService
 from tool_service import ElysiaTools
+from persona import PERSONA_PROMPT, summarize_for_speech
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,12 +25,7 @@ class ConversationalAI:
         self.response_log_dir = "response_logs"
         os.makedirs(self.response_log_dir, exist_ok=True)
 
-        # Persona + capability note (keep short; details in memory context)
-        self.persona_prompt = (
-            "You are Elysia: blunt, high-context, tool-using local AI. "
-            "Use tools when they improve accuracy or enable real action. "
-            "Prefer concrete steps over vague generalities. Avoid corporate tone."
-        )
+        self.persona_prompt = PERSONA_PROMPT
 
         # Ingest prior crash info (from watchdog or last run)
         if os.path.exists("crash_info.txt"):
@@ -47,18 +43,7 @@ class ConversationalAI:
         Only write the full text to disk if it exceeds a length threshold
         (env ELYSIA_SAVE_THRESHOLD, default 800). Returns (summary, path_or_None).
         """
-        # summarize (no tools)
-        try:
-            summary = self.llm.prompt(
-                f"Summarize succinctly in 1-2 sentences for speech:\n\n{full_response}",
-                system="Be direct, no fluff."
-            )
-            # cope with llm_service returning an object with .text()
-            if hasattr(summary, "text"):
-                summary = summary.text()
-        except Exception as e:
-            logging.error(f"Summary failed: {e}")
-            summary = (full_response[:150] + "...") if len(full_response) > 150 else full_response
+        summary = summarize_for_speech(self.llm, full_response)
 
         # gate file write by length
         threshold = int(os.getenv("ELYSIA_SAVE_THRESHOLD", "800"))
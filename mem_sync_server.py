@@ -3,6 +3,7 @@ import os, json, time
 from fastapi import FastAPI, Header, HTTPException, UploadFile, File
 from pydantic import BaseModel
 import chromadb
+from memory_service_chroma import user_collection_name
 
 AUTH_TOKEN = os.getenv("ELYSIA_SYNC_TOKEN", "changeme")
 DB_PATH = os.getenv("ELYSIA_DB_PATH", "./chroma_db")
@@ -17,9 +18,15 @@ def _ingest_record(r):
     speaker = r.get("speaker","unknown")
     tid = r.get("turn_id", f"sys-{int(r.get('ts', time.time()))}")
     rid = f"{speaker}_{tid}_{abs(hash(text))}"
-    coll.add(
+    meta = {"speaker": speaker, "turn_id": tid, "ts": r.get("ts")}
+    target = coll
+    if r.get("user_id"):
+        # server-session turns go to that user's collection, never the local one
+        meta["user_id"] = r["user_id"]
+        target = client.get_or_create_collection(name=user_collection_name(COLLECTION, r["user_id"]))
+    target.add(
         documents=[text],
-        metadatas=[{"speaker": speaker, "turn_id": tid, "ts": r.get("ts")}],
+        metadatas=[meta],
         ids=[rid]
     )
 
@@ -1,5 +1,7 @@
 import chromadb
 import uuid
+import copy
+import re
 import logging
 
 # NEW: journaling
@@ -21,16 +23,32 @@ def _append_journal(entry: dict):
     with open(_journal_path(), "a", encoding="utf-8") as f:
         f.write(json.dumps(entry, ensure_ascii=False) + "\n")
 
+def user_collection_name(base: str, user_id: str) -> str:
+    """Per-user collection name, kept within Chroma's naming rules (3-63 chars of [A-Za-z0-9._-])."""
+    safe = re.sub(r"[^A-Za-z0-9_-]", "_", user_id).strip("_-") or "user"
+    name = f"{base}__{safe}"
+    if safe != user_id or len(name) > 63:
+        # disambiguate ids that collapse to the same safe form
+        digest = hashlib.sha1(user_id.encode("utf-8")).hexdigest()[:8]
+        name = f"{base}__{safe[:63 - len(base) - 11]}-{digest}"
+    return name
+
 class ChromaMemoryService:
     """A memory service using ChromaDB for persistent conversational memory."""
 
-    def __init__(self, db_path="./chroma_db", collection_name="persona_memory"):
+    def __init__(self, db_path="./chroma_db", collection_name="persona_memory", user_id: str | None = None):
         """
         Initializes the ChromaDB memory service.
         :param db_path: The directory to persist the database.
         :param collection_name: The name of the collection to store memories.
+        :param user_id: Optional namespace; when set, memories live in that user's own collection.
         """
         logging.info("Initializing ChromaMemoryService...")
+        self.collection_name = collection_name
+        self.user_id = user_id
+        self.journal = True
+        if user_id:
+            collection_name = user_collection_name(collection_name, user_id)
         try:
             self._client = chromadb.PersistentClient(path=db_path)
             self._collection = self._client.get_or_create_collection(name=collection_name)
@@ -39,6 +57,39 @@ class ChromaMemoryService:
             logging.error(f"Failed to initialize ChromaDB: {e}. Ensure SQLite version is >= 3.35.")
             raise
 
+    def for_user(self, user_id: str, ephemeral: bool = False) -> "ChromaMemoryService":
+        """
+        Returns a view of this service scoped to one user's own collection, so the
+        unscoped (local) collection never sees other users' turns.
+        Shares the underlying client. Ephemeral views skip the journal; call drop().
+        """
+        view = copy.copy(self)
+        view.user_id = user_id
+        view.journal = not ephemeral
+        view._collection = self._client.get_or_create_collection(
+            name=user_collection_name(self.collection_name, user_id))
+        return view
+
+    def drop(self):
+        """Deletes a user-scoped collection (e.g. an anonymous session's). No-op when unscoped."""
+        if not self.user_id:
+            return
+        try:
+            self._client.delete_collection(name=self._collection.name)
+            logging.info(f"Dropped memory collection '{self._collection.name}'.")
+        except Exception as e:
+            logging.warning(f"Failed to drop collection '{self._collection.name}': {e}")
+
+    def _meta(self, **fields) -> dict:
+        # Chroma rejects None metadata values, so only tag when namespaced
+        if self.user_id:
+            fields["user_id"] = self.user_id
+        return fields
+
+    def _journal(self, entry: dict):
+        if self.journal:
+            _append_journal(entry)
+
     def add_memory(self, user_input: str, assistant_response: str):
         """
         Adds a conversational turn to the memory.
@@ -52,38 +103,38 @@ class ChromaMemoryService:
                 f"Assistant responded: {assistant_response}"
             ],
             metadatas=[
-                {"speaker": "user", "turn_id": turn_id, "ts": time.time()},
-                {"speaker": "assistant", "turn_id": turn_id, "ts": time.time()}
+                self._meta(speaker="user", turn_id=turn_id, ts=time.time()),
+                self._meta(speaker="assistant", turn_id=turn_id, ts=time.time())
             ],
             ids=[f"user_{turn_id}", f"assistant_{turn_id}"]
         )
         logging.info(f"Added memory for turn {turn_id}.")
 
         # NEW: journal both sides of the turn (append-only, NDJSON)
-        _append_journal({
-            "type":"turn", "ts": time.time(), "turn_id": turn_id,
-            "speaker":"user", "text": user_input
-        })
-        _append_journal({
-            "type":"turn", "ts": time.time(), "turn_id": turn_id,
-            "speaker":"assistant", "text": assistant_response
-        })
+        self._journal(self._meta(
+            type="turn", ts=time.time(), turn_id=turn_id,
+            speaker="user", text=user_input
+        ))
+        self._journal(self._meta(
+            type="turn", ts=time.time(), turn_id=turn_id,
+            speaker="assistant", text=assistant_response
+        ))
 
     def add_system_memory(self, system_note: str):
         """Adds a system-level memory, like a self-reflection."""
         note_id = str(uuid.uuid4())
         self._collection.add(
             documents=[system_note],
-            metadatas=[{"speaker": "system", "ts": time.time()}],
+            metadatas=[self._meta(speaker="system", ts=time.time())],
             ids=[f"system_{note_id}"]
         )
         logging.info(f"Added system memory: '{system_note}'")
 
         # NEW: journal system notes too
-        _append_journal({
-            "type":"system", "ts": time.time(),
-            "speaker":"system", "text": system_note
-        })
+        self._journal(self._meta(
+            type="system", ts=time.time(),
+            speaker="system", text=system_note
+        ))
 
     def retrieve_relevant_memories(self, query: str, n_results: int = 5) -> list[str]:
         """
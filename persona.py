@@ -0,0 +1,26 @@
+# persona.py
+# Shared by main_app (local mic loop) and session_server (multi-session mode).
+import logging
+
+# Persona + capability note (keep short; details in memory context)
+PERSONA_PROMPT = (
+    "You are Elysia: blunt, high-context, tool-using local AI. "
+    "Use tools when they improve accuracy or enable real action. "
+    "Prefer concrete steps over vague generalities. Avoid corporate tone."
+)
+
+def summarize_for_speech(llm_service, full_response: str) -> str:
+    """Create a 1–2 sentence spoken summary; falls back to truncation on error."""
+    # summarize (no tools)
+    try:
+        summary = llm_service.prompt(
+            f"Summarize succinctly in 1-2 sentences for speech:\n\n{full_response}",
+            system="Be direct, no fluff."
+        )
+        # cope with llm_service returning an object with .text()
+        if hasattr(summary, "text"):
+            summary = summary.text()
+    except Exception as e:
+        logging.error(f"Summary failed: {e}")
+        summary = (full_response[:150] + "...") if len(full_response) > 150 else full_response
+    return summary
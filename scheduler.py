@@ -0,0 +1,96 @@
+# scheduler.py
+import asyncio, logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+class FairScheduler:
+    """
+    Shares one blocking model between many sessions.
+    Each session gets its own FIFO; the worker takes jobs round-robin across
+    sessions (so a chatty client can't starve the others) and runs `job_fn`
+    on at most `max_concurrent` dedicated threads. Every job's future resolves
+    as soon as that job finishes — nobody waits on a neighbour's slower work.
+    Keep `max_concurrent=1` unless the backend really batches concurrent
+    requests (e.g. Ollama with OLLAMA_NUM_PARALLEL).
+    """
+
+    def __init__(self, name: str, job_fn, max_concurrent: int = 1):
+        self.name = name
+        self.job_fn = job_fn
+        self.max_concurrent = max(1, max_concurrent)
+        self._queues: dict[str, deque] = {}
+        self._order: deque[str] = deque()  # sessions with pending work, round-robin
+        self._wake = None
+        self._slots = None
+        self._task = None
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent,
+                                            thread_name_prefix=f"sched-{name}")
+
+    def start(self):
+        """Start the worker on the running loop."""
+        self._wake = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._task = asyncio.get_running_loop().create_task(self._worker())
+        logging.info(f"Scheduler '{self.name}' started (max_concurrent={self.max_concurrent}).")
+
+    async def submit(self, session_id: str, payload):
+        """Queue `payload` for `session_id` and wait for its result."""
+        fut = asyncio.get_running_loop().create_future()
+        q = self._queues.setdefault(session_id, deque())
+        q.append((payload, fut))
+        if session_id not in self._order:
+            self._order.append(session_id)
+        self._wake.set()
+        return await fut
+
+    def drop(self, session_id: str):
+        """Cancel everything still queued for a session (e.g. on disconnect)."""
+        q = self._queues.pop(session_id, None)
+        if session_id in self._order:
+            self._order.remove(session_id)
+        for _, fut in q or ():
+            fut.cancel()
+
+    def _take(self):
+        """Next live job in round-robin order, or None if nothing is queued."""
+        while self._order:
+            sid = self._order.popleft()
+            q = self._queues.get(sid)
+            while q:
+                payload, fut = q.popleft()
+                if not fut.done():  # skip submits cancelled while queued
+                    break
+            else:
+                self._queues.pop(sid, None)
+                continue
+            if q:
+                self._order.append(sid)  # back of the line
+            else:
+                self._queues.pop(sid, None)
+            return payload, fut
+        return None
+
+    def _finished(self, fut, done):
+        self._slots.release()
+        if fut.done():
+            return
+        if done.exception() is not None:
+            fut.set_exception(done.exception())
+        else:
+            fut.set_result(done.result())
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            while self._order:
+                # pick the job only once a slot is free, so drop()/cancel still apply
+                await self._slots.acquire()
+                job = self._take()
+                if job is None:
+                    self._slots.release()
+                    break
+                payload, fut = job
+                done = loop.run_in_executor(self._executor, self.job_fn, payload)
+                done.add_done_callback(lambda d, fut=fut: self._finished(fut, d))
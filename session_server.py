@@ -0,0 +1,268 @@
+# session_server.py
+# Multi-session mode: one process, shared models, many text/voice clients over WebSocket.
+#
+# Protocol (JSON text frames, same shapes as tts_ws where they overlap):
+#   client -> {"type":"hello","token":"...","voice":true}
+#   server -> {"type":"session","id":"...","user":"alice"}   (user is decided by the token)
+#   client -> {"type":"text","text":"..."}
+#   client -> {"type":"audio","sr":16000,"pcm":"<b64 float32 mono utterance>"}
+#   server -> {"type":"transcript","text":...} {"type":"reply","text":...}
+#             {"type":"state","value":...} {"type":"error","message":...}
+#             tts_begin / tts_chunk / tts_end   (voice sessions only)
+import asyncio, json, base64, hmac, logging, os, time, uuid, traceback
+from collections import deque
+import numpy as np
+import websockets
+
+from persona import PERSONA_PROMPT, summarize_for_speech
+from llm_service import LLMService
+from tts_service import TextToSpeechService
+from stt_service import WhisperTranscriber
+from memory_service_chroma import ChromaMemoryService as MemoryService
+from tool_service import ElysiaTools
+from scheduler import FairScheduler
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[logging.FileHandler("elysia_server.log", mode="a", encoding="utf-8"),
+              logging.StreamHandler()]
+)
+
+HOST = os.getenv("ELYSIA_SERVER_HOST", "127.0.0.1")
+PORT = int(os.getenv("ELYSIA_SERVER_PORT", "8766"))  # 8765 is the tts_ws UI broadcaster
+LOCAL_HOSTS = {"127.0.0.1", "localhost", "::1"}
+
+def _parse_user_tokens(spec: str) -> dict[str, str]:
+    """ELYSIA_SERVER_TOKENS="alice:tok1,bob:tok2" -> {token: user_id}."""
+    tokens = {}
+    for pair in spec.split(","):
+        user, sep, token = pair.strip().partition(":")
+        if sep and user.strip() and token.strip():
+            tokens[token.strip()] = user.strip()
+    return tokens
+
+# The token decides the memory namespace; unset = anonymous, per-session memory only
+USER_TOKENS = _parse_user_tokens(os.getenv("ELYSIA_SERVER_TOKENS", ""))
+HISTORY_TURNS = int(os.getenv("ELYSIA_SESSION_HISTORY", "6"))
+# Concurrent LLM jobs; >1 only helps if the backend batches them (OLLAMA_NUM_PARALLEL)
+LLM_BATCH = max(1, int(os.getenv("ELYSIA_LLM_BATCH", "1")))
+# Concurrent STT jobs; the WhisperModel is built with the same number of workers
+STT_WORKERS = max(1, int(os.getenv("ELYSIA_STT_WORKERS", "1")))
+# TTS has no knob: one KPipeline, no batch API, not safe to call from several threads
+# Tools can read/write files and run shell — never hand them to remote users by default
+ALLOW_TOOLS = os.getenv("ELYSIA_SERVER_TOOLS", "0") == "1"
+
+def _user_for_token(token: str) -> str | None:
+    for known, user_id in USER_TOKENS.items():
+        if hmac.compare_digest(known, token):
+            return user_id
+    return None
+
+class Session:
+    """Per-client conversation state; models live on the server."""
+
+    def __init__(self, ws, user_id: str | None, voice: bool):
+        self.id = uuid.uuid4().hex[:12]
+        self.ws = ws
+        # unauthenticated sessions get a throwaway namespace nobody else can reach
+        self.anonymous = user_id is None
+        self.user_id = user_id or f"anon-{self.id}"
+        self.voice = voice
+        self.memory: MemoryService | None = None     # scoped view; built off-loop by the server
+        self.history = deque(maxlen=HISTORY_TURNS)  # (user, assistant) pairs
+        self.inbox = asyncio.Queue(maxsize=8)         # messages waiting for their turn
+
+    async def send(self, obj: dict):
+        await self.ws.send(json.dumps(obj))
+
+class ElysiaServer:
+    def __init__(self):
+        if not USER_TOKENS and HOST not in LOCAL_HOSTS:
+            raise SystemExit(f"Refusing to listen on {HOST} without ELYSIA_SERVER_TOKENS; "
+                             "set per-user tokens or bind to 127.0.0.1.")
+        # Load every model exactly once; sessions only hold state
+        self.llm = LLMService()
+        self.tts = TextToSpeechService(ui_ws=False)  # 8765 belongs to the local app's UI
+        self.stt = WhisperTranscriber(num_workers=STT_WORKERS)
+        self.memory = MemoryService()
+        self.tools = [ElysiaTools()] if ALLOW_TOOLS else None
+        self.sessions: dict[str, Session] = {}
+
+        self.llm_sched = FairScheduler("llm", self._llm_job, max_concurrent=LLM_BATCH)
+        self.tts_sched = FairScheduler("tts", self._tts_job, max_concurrent=1)
+        self.stt_sched = FairScheduler("stt", self._stt_job, max_concurrent=STT_WORKERS)
+
+    # ---- job functions (run on each scheduler's threads, one item per call) ----
+    def _llm_job(self, job):
+        kind, prompt, system = job
+        try:
+            if kind == "summary":
+                return summarize_for_speech(self.llm, prompt)
+            return self.llm.chain(prompt, system=system, tools=self.tools)
+        except Exception as e:
+            logging.error(f"LLM job failed: {e}")
+            raise
+
+    def _tts_job(self, text: str) -> list:
+        # Kokoro has no cross-request batch API and one shared engine: always one job at a time
+        try:
+            return list(self.tts.synthesize(text)) if text else []
+        except Exception as e:
+            logging.error(f"TTS job failed: {e}")
+            raise
+
+    def _stt_job(self, audio) -> str:
+        try:
+            return self.stt.transcribe(audio)
+        except Exception as e:
+            logging.error(f"STT job failed: {e}")
+            raise
+
+    # ---- per-session pipeline ----
+    async def _speak(self, session: Session, text: str):
+        chunks = await self.tts_sched.submit(session.id, text)
+        msg_id = f"msg_{int(time.time()*1000)}"
+        await session.send({"type":"tts_begin","sr":self.tts.sample_rate,"id":msg_id})
+        for audio in chunks:
+            b = base64.b64encode(audio.tobytes()).decode("ascii")
+            await session.send({"type":"tts_chunk","id":msg_id,"ts":time.time(),"pcm":b})
+        await session.send({"type":"tts_end","id":msg_id})
+
+    async def _turn(self, session: Session, user_input: str):
+        logging.info(f"[{session.id}/{session.user_id}] USER: {user_input}")
+        await session.send({"type":"state","value":"thinking"})
+
+        memories = await asyncio.to_thread(session.memory.retrieve_relevant_memories, user_input)
+        memory_context = "\n".join(memories) if memories else ""
+        recent = "\n".join(f"User: {u}\nElysia: {a}" for u, a in session.history)
+        system = (
+            PERSONA_PROMPT
+            + "\n\nRelevant context:\n"
+            + (memory_context or "[none]")
+            + "\n\nRecent conversation:\n"
+            + (recent or "[none]")
+        )
+
+        full_response = await self.llm_sched.submit(session.id, ("chain", user_input, system))
+        session.history.append((user_input, full_response))
+        await session.send({"type":"reply","text":full_response})
+
+        if session.voice:
+            await session.send({"type":"state","value":"speaking"})
+            summary = await self.llm_sched.submit(session.id, ("summary", full_response, None))
+            await self._speak(session, summary)
+
+        await asyncio.to_thread(session.memory.add_memory, user_input, full_response)
+        await session.send({"type":"state","value":"idle"})
+
+    async def _on_message(self, session: Session, msg: dict):
+        kind = msg.get("type")
+        if kind == "text":
+            text = (msg.get("text") or "").strip()
+            if text:
+                await self._turn(session, text)
+        elif kind == "audio":
+            if int(msg.get("sr", WhisperTranscriber.SAMPLE_RATE)) != WhisperTranscriber.SAMPLE_RATE:
+                await session.send({"type":"error","message":"audio must be 16000 Hz float32"})
+                return
+            audio = np.frombuffer(base64.b64decode(msg.get("pcm", "")), dtype=np.float32)
+            await session.send({"type":"state","value":"transcribing"})
+            text = await self.stt_sched.submit(session.id, audio)
+            await session.send({"type":"transcript","text":text})
+            if text:
+                await self._turn(session, text)
+            else:
+                await session.send({"type":"state","value":"idle"})
+        else:
+            await session.send({"type":"error","message":f"unknown message type {kind!r}"})
+
+    async def _handler(self, ws):
+        try:
+            hello = json.loads(await asyncio.wait_for(ws.recv(), timeout=10))
+            ok = isinstance(hello, dict) and hello.get("type") == "hello"
+        except Exception:
+            ok = False
+        if not ok:
+            await ws.close(1002, "expected hello")
+            return
+        user_id = None
+        if USER_TOKENS:
+            user_id = _user_for_token(str(hello.get("token") or ""))
+            if user_id is None:
+                await ws.close(1008, "bad auth")
+                return
+
+        session = Session(ws, user_id, bool(hello.get("voice")))
+        try:
+            # get_or_create_collection is sqlite I/O — keep it off the loop like every other Chroma call
+            session.memory = await asyncio.to_thread(
+                self.memory.for_user, session.user_id, ephemeral=session.anonymous)
+        except Exception as e:
+            logging.error(f"[{session.id}] memory init failed: {e}")
+            await ws.close(1011, "memory unavailable")
+            return
+        self.sessions[session.id] = session
+        logging.info(f"Session {session.id} opened for '{session.user_id}' ({len(self.sessions)} active).")
+        # Reader stays on the socket; turns run in their own task so a disconnect
+        # cancels the in-flight submit and its job never reaches the shared models.
+        worker = asyncio.create_task(self._session_loop(session))
+        try:
+            await session.send({"type":"session","id":session.id,"user":session.user_id})
+            async for raw in ws:
+                try:
+                    msg = json.loads(raw)
+                except ValueError:
+                    await session.send({"type":"error","message":"invalid JSON"})
+                    continue
+                try:
+                    session.inbox.put_nowait(msg)
+                except asyncio.QueueFull:
+                    # never block the reader: it must stay free to notice the disconnect
+                    await session.send({"type":"error","message":"busy: too many pending messages"})
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            worker.cancel()
+            try:
+                await worker
+            except (asyncio.CancelledError, Exception):
+                pass
+            for sched in (self.llm_sched, self.tts_sched, self.stt_sched):
+                sched.drop(session.id)
+            if session.anonymous:
+                await asyncio.to_thread(session.memory.drop)
+            self.sessions.pop(session.id, None)
+            logging.info(f"Session {session.id} closed ({len(self.sessions)} active).")
+
+    async def _session_loop(self, session: Session):
+        """Handle one session's messages in order; closes the socket when it stops."""
+        try:
+            while True:
+                msg = await session.inbox.get()
+                try:
+                    await self._on_message(session, msg)
+                except websockets.ConnectionClosed:
+                    return
+                except Exception as e:
+                    logging.error(f"[{session.id}] error: {e}\n" + traceback.format_exc())
+                    try:
+                        await session.send({"type":"error","message":str(e)})
+                    except websockets.ConnectionClosed:
+                        return
+        finally:
+            # wake the reader so _handler's cleanup always runs
+            await session.ws.close()
+
+    async def serve(self):
+        for sched in (self.llm_sched, self.tts_sched, self.stt_sched):
+            sched.start()
+        async with websockets.serve(self._handler, HOST, PORT, max_size=16 * 1024 * 1024):
+            logging.info(f"Elysia session server listening on ws://{HOST}:{PORT}")
+            await asyncio.Future()  # run forever
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(ElysiaServer().serve())
+    except KeyboardInterrupt:
+        logging.info("Shutdown requested.")
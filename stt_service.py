@@ -1,12 +1,15 @@
-from RealtimeSTT import AudioToTextRecorder
+import numpy as np
 import logging
 import traceback
+import os
 
 class SpeechToTextService:
     """A service for real-time speech-to-text transcription."""
 
     def __init__(self):
         logging.info("Initializing SpeechToTextService...")
+        # imported here so WhisperTranscriber users don't pull in the mic stack
+        from RealtimeSTT import AudioToTextRecorder
 
         # Define the model and language settings first.
         self.model = "tiny.en"
@@ -46,6 +49,41 @@ class SpeechToTextService:
         print(f"Transcription: '{transcription}'")
         return transcription
 
+class WhisperTranscriber:
+    """
+    Mic-less Whisper for server mode: transcribes complete 16 kHz float32 clips
+    sent by remote clients. One instance is shared by every session.
+    """
+
+    SAMPLE_RATE = 16000
+
+    def __init__(self, model: str | None = None, num_workers: int = 1):
+        """
+        :param model: Whisper model name (default env ELYSIA_STT_MODEL or 'tiny.en').
+        :param num_workers: Parallel transcribe() calls the model can serve from different threads.
+        """
+        logging.info("Initializing WhisperTranscriber...")
+        # faster_whisper ships as a RealtimeSTT dependency
+        from faster_whisper import WhisperModel
+
+        self.model_name = model or os.getenv("ELYSIA_STT_MODEL", "tiny.en")
+        self.language = "en"
+        try:
+            self.model = WhisperModel(self.model_name, device=os.getenv("ELYSIA_STT_DEVICE", "cpu"),
+                                      num_workers=max(1, num_workers))
+            logging.info(f"WhisperTranscriber initialized with model '{self.model_name}'.")
+        except Exception as e:
+            logging.error(f"Failed to initialize WhisperModel: {e}")
+            logging.error(traceback.format_exc())
+            raise
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        """Transcribe one utterance (mono float32 @ 16 kHz) and return the text."""
+        if audio is None or not len(audio):
+            return ""
+        segments, _ = self.model.transcribe(audio.astype(np.float32), language=self.language)
+        return " ".join(seg.text.strip() for seg in segments).strip()
+
 if __name__ == '__main__':
     # Example usage of the service
     stt = SpeechToTextService()
@@ -0,0 +1,4 @@
+# Modules live flat at the repo root; make them importable however pytest is invoked.
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,97 @@
+import asyncio, threading, time
+import pytest
+
+from scheduler import FairScheduler
+
+def _recording_scheduler(max_concurrent=1):
+    """Scheduler whose first job ("gate") blocks until released, so the rest queue up."""
+    ran, gate = [], threading.Event()
+
+    def job(payload):
+        if payload == "gate":
+            gate.wait(5)
+        ran.append(payload)
+        if payload.startswith("bad"):
+            raise ValueError(payload)
+        return payload.upper()
+
+    return FairScheduler("test", job, max_concurrent=max_concurrent), ran, gate
+
+async def _queued(sched, jobs):
+    """Submit (session, payload) pairs behind the gate; returns their tasks."""
+    tasks = [asyncio.create_task(sched.submit(sid, p)) for sid, p in jobs]
+    await asyncio.sleep(0.05)  # let every submit enqueue
+    return tasks
+
+def test_round_robin_across_sessions():
+    async def main():
+        sched, ran, gate = _recording_scheduler()
+        sched.start()
+        gate_task = asyncio.create_task(sched.submit("g", "gate"))
+        await asyncio.sleep(0.05)
+        tasks = await _queued(sched, [("a", "a1"), ("a", "a2"), ("a", "a3"), ("b", "b1"), ("c", "c1")])
+        gate.set()
+        await asyncio.gather(gate_task, *tasks)
+        return ran
+
+    assert asyncio.run(main()) == ["gate", "a1", "b1", "c1", "a2", "a3"]
+
+def test_failed_job_does_not_affect_others():
+    async def main():
+        sched, _, gate = _recording_scheduler()
+        sched.start()
+        gate.set()
+        return await asyncio.gather(
+            sched.submit("a", "a1"), sched.submit("b", "bad1"), sched.submit("c", "c1"),
+            return_exceptions=True)
+
+    a, b, c = asyncio.run(main())
+    assert a == "A1" and c == "C1"
+    assert isinstance(b, ValueError)
+
+def test_drop_cancels_queued_jobs():
+    async def main():
+        sched, ran, gate = _recording_scheduler()
+        sched.start()
+        gate_task = asyncio.create_task(sched.submit("g", "gate"))
+        await asyncio.sleep(0.05)
+        a1, a2, b1 = await _queued(sched, [("a", "a1"), ("a", "a2"), ("b", "b1")])
+        sched.drop("a")
+        gate.set()
+        await gate_task
+        assert await b1 == "B1"
+        for t in (a1, a2):
+            with pytest.raises(asyncio.CancelledError):
+                await t
+        return ran
+
+    assert asyncio.run(main()) == ["gate", "b1"]
+
+def test_cancelled_submit_never_runs():
+    async def main():
+        sched, ran, gate = _recording_scheduler()
+        sched.start()
+        gate_task = asyncio.create_task(sched.submit("g", "gate"))
+        await asyncio.sleep(0.05)
+        a1, b1 = await _queued(sched, [("a", "a1"), ("b", "b1")])
+        a1.cancel()
+        gate.set()
+        await asyncio.gather(gate_task, b1)
+        return ran
+
+    assert asyncio.run(main()) == ["gate", "b1"]
+
+def test_each_job_resolves_when_it_finishes():
+    async def main():
+        sched = FairScheduler("test", lambda d: time.sleep(d) or d, max_concurrent=3)
+        sched.start()
+        t0 = time.monotonic()
+
+        async def timed(sid, d):
+            await sched.submit(sid, d)
+            return time.monotonic() - t0
+
+        return await asyncio.gather(timed("a", 0.5), timed("b", 0.5), timed("c", 0.05))
+
+    _, _, short = asyncio.run(main())
+    assert short < 0.3
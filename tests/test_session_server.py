@@ -0,0 +1,102 @@
+import asyncio, json, time
+import pytest
+
+# Needs the full server stack (websockets, Kokoro, Whisper, Chroma, llm) importable;
+# the models themselves are replaced below, nothing is loaded.
+session_server = pytest.importorskip("session_server")
+from websockets.exceptions import ConnectionClosedOK
+
+from scheduler import FairScheduler
+
+class FakeWS:
+    """Just enough of a websockets connection for ElysiaServer._handler."""
+
+    def __init__(self, hello, messages=()):
+        self._hello = hello if isinstance(hello, str) else json.dumps(hello)
+        self._incoming = asyncio.Queue()
+        for m in messages:
+            self._incoming.put_nowait(json.dumps(m))
+        self.sent = []
+        self.closed = False
+        self.close_code = None
+
+    async def recv(self):
+        return self._hello
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raw = await self._incoming.get()
+        if raw is None:
+            raise StopAsyncIteration
+        return raw
+
+    async def send(self, data):
+        if self.closed:
+            raise ConnectionClosedOK(None, None)
+        self.sent.append(json.loads(data))
+
+    async def close(self, code=1000, reason=""):
+        if not self.closed:
+            self.closed, self.close_code = True, code
+            self._incoming.put_nowait(None)
+
+class FakeMemory:
+    def __init__(self):
+        self.dropped = False
+
+    def for_user(self, user_id, ephemeral=False):
+        return self
+
+    def retrieve_relevant_memories(self, query):
+        return []
+
+    def add_memory(self, user_input, assistant_response):
+        pass
+
+    def drop(self):
+        self.dropped = True
+
+class FakeLLM:
+    def chain(self, prompt, system=None, tools=None):
+        time.sleep(0.1)
+        return "ok"
+
+    def prompt(self, prompt, system=None, tools=None):
+        return "ok"
+
+def _server():
+    srv = object.__new__(session_server.ElysiaServer)
+    srv.llm, srv.memory, srv.tools, srv.sessions = FakeLLM(), FakeMemory(), None, {}
+    srv.llm_sched = FairScheduler("llm", srv._llm_job)
+    srv.tts_sched = FairScheduler("tts", lambda text: [])
+    srv.stt_sched = FairScheduler("stt", lambda audio: "")
+    for sched in (srv.llm_sched, srv.tts_sched, srv.stt_sched):
+        sched.start()
+    return srv
+
+def test_flood_then_disconnect_cleans_up():
+    async def main():
+        srv = _server()
+        flood = [{"type":"text","text":f"msg {i}"} for i in range(20)]
+        ws = FakeWS({"type":"hello"}, flood)
+        handler = asyncio.create_task(srv._handler(ws))
+        await asyncio.sleep(0.15)
+        await ws.close()
+        await asyncio.wait_for(handler, timeout=2)
+        return srv, ws
+
+    srv, ws = asyncio.run(main())
+    assert srv.sessions == {}
+    assert srv.memory.dropped  # anonymous namespace removed
+    assert any(m.get("message", "").startswith("busy") for m in ws.sent)
+
+@pytest.mark.parametrize("hello", ['"hi"', "[]", "not json", '{"type":"text"}'])
+def test_bad_hello_is_rejected(hello):
+    async def main():
+        ws = FakeWS(hello)
+        await asyncio.wait_for(_server()._handler(ws), timeout=2)
+        return ws
+
+    assert asyncio.run(main()).close_code == 1002
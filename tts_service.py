@@ -9,17 +9,29 @@ import os
 # hard-disable cuDNN for Kokoro
 torch.backends.cudnn.enabled = False  # NEW: timestamps for stream events
 
-# NEW: WS broadcaster for UI
-try:
-    from tts_ws import WS
-except Exception:
-    WS = None
-    logging.warning("tts_ws.WS not available; UI streaming disabled.")
+# NEW: WS broadcaster for UI — importing tts_ws binds port 8765, so it is started
+# by TextToSpeechService(ui_ws=True) (the local default) rather than at import;
+# session_server passes ui_ws=False. ELYSIA_UI_WS=0 disables it outright.
+_WS = None
+
+def _ui_ws():
+    global _WS
+    if _WS is None:
+        _WS = False
+        if os.getenv("ELYSIA_UI_WS", "1") == "1":
+            try:
+                from tts_ws import WS
+                _WS = WS
+            except Exception:
+                logging.warning("tts_ws.WS not available; UI streaming disabled.")
+    return _WS or None
 
 class TextToSpeechService:
     """Drop-in: keeps sd+WS behavior; adds GPU→CPU fallback + env toggles."""
-    def __init__(self):
+    def __init__(self, ui_ws: bool = True):
         logging.info("Initializing TextToSpeechService...")
+        # start the UI broadcaster now so a page opened before the first utterance connects
+        self.ws = _ui_ws() if ui_ws else None
         logging.getLogger('numba').setLevel(logging.WARNING)
         logging.getLogger('torch').setLevel(logging.WARNING)
 
@@ -48,19 +60,24 @@ class TextToSpeechService:
                 logging.error(traceback.format_exc())
                 raise
 
+    def synthesize(self, text: str):
+        """Yield float32 audio chunks for `text` without touching the speaker or WS."""
+        for result in self.engine(text=text, voice=self.voice):
+            if result.audio is None:
+                continue
+            yield result.audio.detach().cpu().numpy().astype(np.float32)
+
     def speak(self, text: str):
         if not text:
             return
+        WS = self.ws
         try:
             logging.info(f"TTS generating audio for: {text!r}")
             msg_id = f"msg_{int(time.time()*1000)}"
             if WS: WS.tts_begin(self.sample_rate, msg_id)
 
             chunks = []
-            for result in self.engine(text=text, voice=self.voice):
-                if result.audio is None:
-                    continue
-                audio = result.audio.detach().cpu().numpy().astype(np.float32)
+            for audio in self.synthesize(text):
                 chunks.append(audio)
                 if WS:
                     WS.tts_chunk(msg_id, time.time(), audio.tobytes())